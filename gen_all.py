@@ -2,56 +2,164 @@
 # /// script
 # requires-python = ">=3.13"
 # dependencies = [
+#   "numpy",
 #   "pandas>=2.3.2",
+#   "lxml",
 #   "openpyxl>=3.1.5",
 #   "python-docx>=1.1.2",
-#   "rich>=14.1.0",
 # ]
 # ///
 
 from __future__ import annotations
 
+import argparse
+import copy
+import hashlib
+import io
+import itertools
+import os
+import pickle
+import re
+import tempfile
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, TypedDict
 
+import numpy as np
+import openpyxl
 import pandas as pd
-from rich.console import Console
+from lxml import etree
+from openpyxl.cell.cell import ERROR_CODES
+import docx
 from docx import Document
-from docx.enum.table import WD_TABLE_ALIGNMENT
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.shared import Pt
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Emu, Inches
+from docx.text.paragraph import Paragraph
 
 
 WORKBOOK_NAME = "rosters.xlsx"
 TEACHER_CSV_NAME = "room_teachers.csv"
 OUTPUT_DIR = Path("out")
+CACHE_DIR = OUTPUT_DIR.parent / ".cache"
+# Bump whenever the workbook reader's output changes so stale pickles are not reused.
+CACHE_VERSION = 3
+
+# (sheet name, grade label, output file, generator kind), in output order.
+SHEETS_SPEC: List[tuple[str, str, str, str]] = [
+    ("New PreK", "PreK", "New_PreK.docx", "cards"),
+    ("kinder", "Kinder", "kinder.docx", "cards"),
+    ("1st", "1st", "1st.docx", "cards"),
+    ("2nd", "2nd", "2nd_schedule.docx", "sched_2_5"),
+    ("3rd", "3rd", "3rd_schedule.docx", "sched_2_5"),
+    ("4th", "4th", "4th_schedule.docx", "sched_2_5"),
+    ("5th", "5th", "5th_schedule.docx", "sched_2_5"),
+    ("6th", "6th", "6th_schedule.docx", "sched_6_8"),
+    ("7th", "7th", "7th_schedule.docx", "sched_6_8"),
+    ("8th", "8th", "8th_schedule.docx", "sched_6_8"),
+]
+
+# python-docx's default template, read once so each sheet's Document() opens it from memory.
+_DEFAULT_TEMPLATE = Path(docx.__file__).parent.joinpath("templates", "default.docx").read_bytes()
+
+
+def _cell_value(value: object) -> object:
+    # Mirror pandas' openpyxl reader: blank and error cells are missing, whole floats become ints.
+    if value is None or value == "" or (isinstance(value, str) and value in ERROR_CODES):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _header_names(values: List[object]) -> List[object]:
+    # Same mangling as pandas' parser: named headers are deduplicated before "Unnamed: N" ones,
+    # and a ".N" suffix is skipped when another header already uses it.
+    names = [f"Unnamed: {idx}" if value is None else value for idx, value in enumerate(values)]
+    unnamed = [idx for idx, value in enumerate(values) if value is None]
+    named = [idx for idx, value in enumerate(values) if value is not None]
+    counts: Dict[object, int] = {}
+    for idx in named + unnamed:
+        base = name = names[idx]
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[base] = count + 1
+            name = f"{base}.{count}"
+            count = count + 1 if name in names else counts.get(name, 0)
+        names[idx] = name
+        counts[name] = count + 1
+    return names
 
 
-console = Console()
+def _read_all_sheets_readonly(path: Path) -> Dict[str, pd.DataFrame]:
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        frames: Dict[str, pd.DataFrame] = {}
+        for ws in wb.worksheets:
+            ws.reset_dimensions()
+            rows: List[List[object]] = []
+            last_with_data = -1
+            for idx, raw in enumerate(ws.iter_rows(values_only=True)):
+                values = [_cell_value(v) for v in raw]
+                while values and values[-1] is None:
+                    values.pop()
+                if values:
+                    last_with_data = idx
+                rows.append(values)
+            del rows[last_with_data + 1 :]
+            if not rows:
+                frames[ws.title] = pd.DataFrame()
+                continue
+            width = max(len(row) for row in rows)
+            header = _header_names(rows[0] + [None] * (width - len(rows[0])))
+            data = [[np.nan if v is None else v for v in row] + [np.nan] * (width - len(row)) for row in rows[1:]]
+            frames[ws.title] = pd.DataFrame(data, columns=header, dtype=object)
+        return frames
+    finally:
+        wb.close()
 
 
-def load_workbook(path: Path) -> Dict[str, pd.DataFrame]:
+def load_workbook(path: Path, read_cache: bool = True) -> Dict[str, pd.DataFrame]:
     if not path.exists():
         raise FileNotFoundError(
             f"Workbook not found: {path}. Place '{WORKBOOK_NAME}' in the project directory."
         )
-    frames: Dict[str, pd.DataFrame] = pd.read_excel(
-        path, sheet_name=None, engine="openpyxl", dtype=object
-    )
+    data = path.read_bytes()
+    cache_path = CACHE_DIR / f"{hashlib.sha256(data).hexdigest()}-v{CACHE_VERSION}.pkl"
+    if read_cache and cache_path.exists():
+        try:
+            with cache_path.open("rb") as fh:
+                return pickle.load(fh)
+        except Exception:
+            print(f"Warning: ignoring unreadable cache file {cache_path}.")
+    frames = _read_all_sheets_readonly(path)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=CACHE_DIR, suffix=".tmp", delete=False) as fh:
+        tmp_path = Path(fh.name)
+        try:
+            pickle.dump(frames, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        except BaseException:
+            fh.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+    os.replace(tmp_path, cache_path)
     return frames
 
 
 def load_teacher_mapping(csv_path: Path) -> Dict[str, str]:
     if not csv_path.exists():
-        console.print(
-            f"[yellow]Warning:[/] teacher map CSV not found at {csv_path}. The Teacher field will be blank."
+        print(
+            f"Warning: teacher map CSV not found at {csv_path}. The Teacher field will be blank."
         )
         return {}
     df = pd.read_csv(csv_path)
     mapping: Dict[str, str] = {}
-    for _, row in df.iterrows():
-        room = str(row.get("room", "")).strip()
-        teacher = str(row.get("teacher", "")).strip()
+    sub = df.reindex(columns=["room", "teacher"], fill_value="")
+    for room, teacher in sub.itertuples(index=False, name=None):
+        room = str(room).strip()
+        teacher = str(teacher).strip()
         if room:
             mapping[room] = teacher
     return mapping
@@ -59,129 +167,253 @@ def load_teacher_mapping(csv_path: Path) -> Dict[str, str]:
 
 # ----------------------- Shared helpers ----------------------- #
 
-def parse_homeroom_from_header(df: pd.DataFrame) -> Optional[int]:
+def _isna(v: object) -> bool:
+    return v is None or (isinstance(v, float) and v != v)
+
+
+def _to_opt_int(v: object) -> Optional[int]:
+    try:
+        return None if _isna(v) else int(v)
+    except Exception:
+        return None
+
+
+def _whole_room_number(v: object) -> Optional[int]:
+    # Stricter than _to_opt_int: fractional floats and bools are not room numbers.
+    if isinstance(v, bool):
+        return None
+    if isinstance(v, float):
+        return int(v) if v.is_integer() else None
+    try:
+        return int(str(v).strip())
+    except ValueError:
+        return None
+
+
+def room_numbers(series: pd.Series) -> np.ndarray:
+    nums = pd.to_numeric(series, errors="coerce")
+    nums = nums.where(np.isfinite(nums))
+    if (nums.abs() >= -float(np.iinfo("int64").min)).any():
+        # Values outside int64 can't go through Int64; parse this column cell by cell instead.
+        return np.array([_to_opt_int(v) for v in series.tolist()], dtype=object)
+    return np.trunc(nums).astype("Int64").to_numpy(dtype=object, na_value=None)
+
+
+_CLASS_COL_RE = re.compile(r"class (\d+)")
+
+
+class SheetColumns(TypedDict):
+    homeroom_col: Optional[str]
+    homeroom_num: Optional[int]
+    first_col: Optional[str]
+    language_col: Optional[str]
+    # "Class N ..." column for each class number N.
+    class_cols: Dict[int, str]
+
+
+def _index_columns(df: pd.DataFrame) -> SheetColumns:
+    cols = SheetColumns(
+        homeroom_col=None,
+        homeroom_num=None,
+        first_col=None,
+        language_col=None,
+        class_cols={},
+    )
     for col in df.columns:
-        if isinstance(col, str) and col.strip().lower().startswith("homeroom "):
-            suffix = col.strip().split(" ", 1)[1]
-            try:
-                return int(str(suffix).strip())
-            except ValueError:
-                continue
-    if "Room" in df.columns:
-        for value in df["Room"].tolist():
-            if pd.notna(value):
+        if not isinstance(col, str):
+            continue
+        lowered = col.strip().lower()
+        if lowered.startswith("homeroom "):
+            if cols["homeroom_col"] is None:
+                cols["homeroom_col"] = col
+            if cols["homeroom_num"] is None:
                 try:
-                    return int(str(value).strip())
-                except Exception:
+                    cols["homeroom_num"] = int(lowered.split(" ", 1)[1].strip())
+                except ValueError:
                     pass
+        elif cols["first_col"] is None and (lowered in {"first", "first name"} or col.startswith("Unnamed")):
+            cols["first_col"] = col
+        elif cols["language_col"] is None and lowered == "language":
+            cols["language_col"] = col
+        elif match := _CLASS_COL_RE.match(lowered):
+            cols["class_cols"].setdefault(int(match.group(1)), col)
+    return cols
+
+
+def parse_homeroom_from_header(df: pd.DataFrame, cols: Optional[SheetColumns] = None) -> Optional[int]:
+    if cols is None:
+        cols = _index_columns(df)
+    if cols["homeroom_num"] is not None:
+        return cols["homeroom_num"]
+    if "Room" in df.columns:
+        for value in df["Room"].tolist():
+            room = _whole_room_number(value)
+            if room is not None:
+                return room
     return None
 
 
-def extract_names_for_sheet(df: pd.DataFrame) -> List[str]:
-    name_column: Optional[str] = None
-    first_name_column: Optional[str] = None
-
-    for col in df.columns:
-        if isinstance(col, str) and col.strip().lower().startswith("homeroom "):
-            name_column = col
-            break
-
-    for col in df.columns:
-        if isinstance(col, str) and (col.strip().lower() in {"first", "first name"} or col.startswith("Unnamed")):
-            first_name_column = col
-            break
+def extract_names_for_sheet(df: pd.DataFrame, cols: Optional[SheetColumns] = None) -> List[str]:
+    if cols is None:
+        cols = _index_columns(df)
+    name_column = cols["homeroom_col"]
+    first_name_column = cols["first_col"]
 
-    names: List[str] = []
     if name_column is not None and first_name_column is not None:
-        last_series = df[name_column]
-        first_series = df[first_name_column]
-        for last, first in zip(last_series.tolist(), first_series.tolist()):
-            if pd.isna(last) and pd.isna(first):
-                continue
-            last_part = str(last).strip() if pd.notna(last) else ""
-            first_part = str(first).strip() if pd.notna(first) else ""
-            full = f"{last_part}, {first_part}".strip().strip(",")
-            if full:
-                names.append(full)
-        return names
+        last = df[name_column].astype("string").fillna("").str.strip()
+        first = df[first_name_column].astype("string").fillna("").str.strip()
+        full = (last + ", " + first).str.strip().str.strip(",")
+        return full[full.ne("")].tolist()
 
     if name_column is not None:
-        for value in df[name_column].tolist():
-            if pd.isna(value):
-                continue
-            names.append(str(value).strip())
-        return names
+        return df[name_column].dropna().astype(str).str.strip().tolist()
 
     for col in df.columns:
         series = df[col]
         if series.dtype == object:
-            for value in series.tolist():
-                if pd.notna(value):
-                    names.append(str(value).strip())
+            names = series.dropna().astype(str).str.strip().tolist()
             if names:
                 return names
-    return names
+    return []
+
+
+# ----------------------- Raw table XML ----------------------- #
+
+# (text, w:jc value, bold, size in pt) for one table cell.
+CellSpec = tuple[str, str, bool, int]
+# Built schedule tables keyed by the (class 1, class 2[, class 3]) rooms they were filled with.
+TableCache = Dict[tuple[Optional[int], ...], etree._Element]
+
+_TEXT_SPLIT_RE = re.compile(r"(\t|\n)")
+
+
+@lru_cache(maxsize=None)
+def _rpr_template(bold: bool, size: int) -> etree._Element:
+    rpr = OxmlElement("w:rPr")
+    if bold:
+        etree.SubElement(rpr, qn("w:b"))
+    etree.SubElement(rpr, qn("w:sz")).set(qn("w:val"), str(size * 2))
+    return rpr
+
+
+def _append_run(p: etree._Element, text: str, bold: bool, size: int) -> None:
+    r = etree.SubElement(p, qn("w:r"))
+    r.append(copy.deepcopy(_rpr_template(bold, size)))
+    for chunk in _TEXT_SPLIT_RE.split(text):
+        if chunk == "\t":
+            etree.SubElement(r, qn("w:tab"))
+        elif chunk == "\n":
+            etree.SubElement(r, qn("w:br"))
+        elif chunk:
+            t = etree.SubElement(r, qn("w:t"))
+            t.text = chunk
+            if chunk.strip() != chunk:
+                t.set("{http://www.w3.org/XML/1998/namespace}space", "preserve")
+
+
+def _add_bold_run(paragraph: Paragraph, text: str, size: int) -> None:
+    run = paragraph.add_run(text)
+    run._r.insert(0, copy.deepcopy(_rpr_template(True, size)))
+
+
+def _column_width(document: Document, cols: int) -> int:
+    section = document.sections[-1]
+    page_width = section.page_width or Inches(8.5)
+    left_margin = section.left_margin or Inches(1)
+    right_margin = section.right_margin or Inches(1)
+    return Emu((page_width - left_margin - right_margin) // cols).twips
+
+
+def _build_tbl_xml(col_width: int, rows: Sequence[Sequence[CellSpec]]) -> etree._Element:
+    tbl = OxmlElement("w:tbl")
+    tbl_pr = etree.SubElement(tbl, qn("w:tblPr"))
+    etree.SubElement(tbl_pr, qn("w:tblStyle")).set(qn("w:val"), "TableGrid")
+    tbl_w = etree.SubElement(tbl_pr, qn("w:tblW"))
+    tbl_w.set(qn("w:type"), "auto")
+    tbl_w.set(qn("w:w"), "0")
+    etree.SubElement(tbl_pr, qn("w:jc")).set(qn("w:val"), "center")
+    look = etree.SubElement(tbl_pr, qn("w:tblLook"))
+    for attr, val in (
+        ("firstColumn", "1"), ("firstRow", "1"), ("lastColumn", "0"),
+        ("lastRow", "0"), ("noHBand", "0"), ("noVBand", "1"), ("val", "04A0"),
+    ):
+        look.set(qn(f"w:{attr}"), val)
+    grid = etree.SubElement(tbl, qn("w:tblGrid"))
+    width = str(col_width)
+    for _ in range(len(rows[0])):
+        etree.SubElement(grid, qn("w:gridCol")).set(qn("w:w"), width)
+    for cells in rows:
+        tr = etree.SubElement(tbl, qn("w:tr"))
+        for text, jc, bold, size in cells:
+            tc = etree.SubElement(tr, qn("w:tc"))
+            tc_w = etree.SubElement(etree.SubElement(tc, qn("w:tcPr")), qn("w:tcW"))
+            tc_w.set(qn("w:type"), "dxa")
+            tc_w.set(qn("w:w"), width)
+            p = etree.SubElement(tc, qn("w:p"))
+            etree.SubElement(etree.SubElement(p, qn("w:pPr")), qn("w:jc")).set(qn("w:val"), jc)
+            _append_run(p, text, bold, size)
+    return tbl
+
+
+def _build_schedule_tbl_xml(col_width: int, rows: Sequence[tuple[str, str]]) -> etree._Element:
+    specs: List[List[CellSpec]] = [[("TIME", "center", True, 14), ("SCHEDULE", "center", True, 14)]]
+    for time_str, sched in rows:
+        specs.append([(time_str, "center", True, 12), (sched, "left", False, 12)])
+    return _build_tbl_xml(col_width, specs)
+
+
+def _sub_rooms(pattern: re.Pattern[str], text: str, rooms: Dict[int, Optional[int]]) -> str:
+    def repl(match: re.Match[str]) -> str:
+        room = rooms.get(int(match.group(1)))
+        return match.group(0) if room is None else f"{match.group(0)} (Room {room})"
+
+    return pattern.sub(repl, text)
+
+
+def _append_block(document: Document, element: etree._Element) -> None:
+    body = document.element.body
+    sect_pr = body.sectPr
+    if sect_pr is None:
+        body.append(element)
+    else:
+        sect_pr.addprevious(element)
 
 
-def grade_label_for_sheet(sheet_name: str) -> str:
-    lowered = sheet_name.strip().lower()
-    if lowered in {"k", "kinder", "kindergarten"}:
-        return "Kinder"
-    if lowered in {"prek", "pre-k", "pre k", "new prek", "new pre-k"}:
-        return "PreK"
-    return sheet_name.strip()
+# ----------------------- Card generator (PreK/K/1st) ----------------------- #
 
+def _build_card_tbl_xml(col_width: int, teacher: str, room: Optional[int], grade: str) -> etree._Element:
+    headers = ["Teacher", "Homeroom", "Grade"]
+    values = [teacher or "", str(room) if room is not None else "", grade]
+    return _build_tbl_xml(
+        col_width,
+        [
+            [(text, "center", True, 18) for text in headers],
+            [(text, "center", True, 20) for text in values],
+        ],
+    )
 
-# ----------------------- Card generator (PreK/K/1st) ----------------------- #
 
-def add_student_card(document: Document, student_name: str, teacher: str, room: Optional[int], grade: str) -> None:
+def add_student_card(document: Document, student_name: str, card_tbl: etree._Element) -> None:
     title = document.add_paragraph()
-    run_label = title.add_run("Student Name:  ")
-    run_label.bold = True
-    run_label.font.size = Pt(24)
-    run_name = title.add_run(student_name)
-    run_name.bold = True
-    run_name.font.size = Pt(24)
+    _add_bold_run(title, "Student Name:  ", 24)
+    _add_bold_run(title, student_name, 24)
     title.alignment = WD_ALIGN_PARAGRAPH.LEFT
 
-    table = document.add_table(rows=2, cols=3)
-    table.alignment = WD_TABLE_ALIGNMENT.CENTER
-    table.style = "Table Grid"
-    headers = ["Teacher", "Homeroom", "Grade"]
-    values = [teacher or "", str(room) if room is not None else "", grade]
-    for idx, text in enumerate(headers):
-        cell = table.rows[0].cells[idx]
-        p = cell.paragraphs[0]
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        r = p.add_run(text)
-        r.bold = True
-        r.font.size = Pt(18)
-    for idx, text in enumerate(values):
-        cell = table.rows[1].cells[idx]
-        p = cell.paragraphs[0]
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        r = p.add_run(text)
-        r.bold = True
-        r.font.size = Pt(20)
+    _append_block(document, copy.deepcopy(card_tbl))
     document.add_page_break()
 
 
-def generate_cards(frames: Dict[str, pd.DataFrame], teacher_by_room: Dict[str, str], outdir: Path) -> None:
-    for sheet in ["New PreK", "kinder", "1st"]:
-        if sheet not in frames:
-            console.print(f"[yellow]Skipping missing sheet:[/] {sheet}")
-            continue
-        df = frames[sheet]
-        names = extract_names_for_sheet(df)
-        room_num = parse_homeroom_from_header(df)
-        grade = grade_label_for_sheet(sheet)
-        teacher = teacher_by_room.get(str(room_num), "")
-        document = Document()
-        for name in names:
-            add_student_card(document, name, teacher, room_num, grade)
-        out_path = outdir / (sheet.replace("/", "-").replace(" ", "_") + ".docx")
-        document.save(out_path)
-        console.print(f"[green]Wrote[/] {out_path}")
+def _build_cards_sheet(df: pd.DataFrame, grade: str, out_path: Path, teacher_by_room: Dict[str, str]) -> Path:
+    cols = _index_columns(df)
+    names = extract_names_for_sheet(df, cols)
+    room_num = parse_homeroom_from_header(df, cols)
+    teacher = teacher_by_room.get(str(room_num), "")
+    document = Document(io.BytesIO(_DEFAULT_TEMPLATE))
+    card_tbl = _build_card_tbl_xml(_column_width(document, 3), teacher, room_num, grade)
+    for name in names:
+        add_student_card(document, name, card_tbl)
+    document.save(out_path)
+    return out_path
 
 
 # ----------------------- 2nd–5th schedules ----------------------- #
@@ -203,93 +435,59 @@ SCHEDULE_ROWS_2_5: List[tuple[str, str]] = [
 
 def add_header(document: Document, name: str, homeroom: Optional[int], grade: str, language: Optional[str]) -> None:
     line1 = document.add_paragraph()
-    left = line1.add_run(f"Name:{name}")
-    left.bold = True
-    left.font.size = Pt(18)
+    _add_bold_run(line1, f"Name:{name}", 18)
     line1.add_run("\t\t\t")
-    right = line1.add_run(f"Grade:{grade}")
-    right.bold = True
-    right.font.size = Pt(18)
+    _add_bold_run(line1, f"Grade:{grade}", 18)
 
     line2 = document.add_paragraph()
-    l2a = line2.add_run(f"Homeroom: {homeroom if homeroom is not None else ''}")
-    l2a.bold = True
-    l2a.font.size = Pt(18)
+    _add_bold_run(line2, f"Homeroom: {homeroom if homeroom is not None else ''}", 18)
     line2.add_run("\t\t\t")
-    l2b = line2.add_run(f"Language:{language or ''}")
-    l2b.bold = True
-    l2b.font.size = Pt(18)
-
-
-def add_table_2_5(document: Document, class1_room: Optional[int], class2_room: Optional[int]) -> None:
-    table = document.add_table(rows=1, cols=2)
-    table.alignment = WD_TABLE_ALIGNMENT.CENTER
-    table.style = "Table Grid"
-    hdr_time, hdr_sched = table.rows[0].cells
-    p1 = hdr_time.paragraphs[0]
-    p1.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    r1 = p1.add_run("TIME")
-    r1.bold = True
-    r1.font.size = Pt(14)
-    p2 = hdr_sched.paragraphs[0]
-    p2.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    r2 = p2.add_run("SCHEDULE")
-    r2.bold = True
-    r2.font.size = Pt(14)
-    for time_str, sched in SCHEDULE_ROWS_2_5:
-        row = table.add_row()
-        c1, c2 = row.cells
-        p_time = c1.paragraphs[0]
-        p_time.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        rt = p_time.add_run(time_str)
-        rt.bold = True
-        rt.font.size = Pt(12)
-        text = sched
-        if "Reading/Writing-Class 1" in text and class1_room is not None:
-            text = text.replace("Class 1", f"Class 1 (Room {class1_room})")
-        if ("Math-Class 2" in text or "Science-Class 2" in text) and class2_room is not None:
-            text = text.replace("Class 2", f"Class 2 (Room {class2_room})")
-        p_sched = c2.paragraphs[0]
-        p_sched.alignment = WD_ALIGN_PARAGRAPH.LEFT
-        rs = p_sched.add_run(text)
-        rs.font.size = Pt(12)
-
-
-def generate_2_5(frames: Dict[str, pd.DataFrame], outdir: Path) -> None:
-    for sheet in ["2nd", "3rd", "4th", "5th"]:
-        if sheet not in frames:
-            console.print(f"[yellow]Skipping missing sheet:[/] {sheet}")
+    _add_bold_run(line2, f"Language:{language or ''}", 18)
+
+
+# Only the Reading/Writing, Math and Science blocks get a room; "SS-Class 1" and the
+# "Class 1:" advisory block stay as written.
+_CLASS_RE_2_5 = re.compile(r"(?:(?<=Reading/Writing-)|(?<=Math-)|(?<=Science-))Class ([12])")
+
+
+def _apply_rooms_2_5(class1_room: Optional[int], class2_room: Optional[int]) -> List[tuple[str, str]]:
+    rooms = {1: class1_room, 2: class2_room}
+    return [(time_str, _sub_rooms(_CLASS_RE_2_5, sched, rooms)) for time_str, sched in SCHEDULE_ROWS_2_5]
+
+
+def add_table_2_5(
+    document: Document, class1_room: Optional[int], class2_room: Optional[int], tables: TableCache
+) -> None:
+    key = (class1_room, class2_room)
+    tbl = tables.get(key)
+    if tbl is None:
+        tbl = tables[key] = _build_schedule_tbl_xml(_column_width(document, 2), _apply_rooms_2_5(*key))
+    _append_block(document, copy.deepcopy(tbl))
+
+
+def _build_2_5_sheet(df: pd.DataFrame, grade: str, out_path: Path) -> Path:
+    cols = _index_columns(df)
+    name_col = cols["homeroom_col"]
+    lang_col = cols["language_col"]
+    class1_col = cols["class_cols"].get(1)
+    class2_col = cols["class_cols"].get(2)
+    homeroom_num = cols["homeroom_num"]
+    document = Document(io.BytesIO(_DEFAULT_TEMPLATE))
+    tables: TableCache = {}
+    names = df[name_col].to_numpy() if name_col else ()
+    langs = df[lang_col].to_numpy() if lang_col else itertools.repeat(None)
+    c1s = room_numbers(df[class1_col]) if class1_col else itertools.repeat(None)
+    c2s = room_numbers(df[class2_col]) if class2_col else itertools.repeat(None)
+    for name, lang, class1_room, class2_room in zip(names, langs, c1s, c2s):
+        name = str(name).strip()
+        if not name:
             continue
-        df = frames[sheet]
-        name_col = next((c for c in df.columns if isinstance(c, str) and c.lower().startswith("homeroom ")), None)
-        lang_col = "Language" if "Language" in df.columns else None
-        class1_col = "Class 1" if "Class 1" in df.columns else None
-        class2_col = "Class 2" if "Class 2" in df.columns else None
-        homeroom_num = None
-        if isinstance(name_col, str):
-            try:
-                homeroom_num = int(name_col.split(" ", 1)[1])
-            except Exception:
-                pass
-        document = Document()
-        for _, row in df.iterrows():
-            name = str(row.get(name_col, "")).strip()
-            if not name:
-                continue
-            def to_int(v):
-                try:
-                    return int(v) if pd.notna(v) else None
-                except Exception:
-                    return None
-            class1_room = to_int(row.get(class1_col)) if class1_col else None
-            class2_room = to_int(row.get(class2_col)) if class2_col else None
-            language = str(row.get(lang_col, "")).strip() if lang_col else None
-            add_header(document, name, homeroom_num, sheet, language)
-            add_table_2_5(document, class1_room, class2_room)
-            document.add_page_break()
-        out_path = outdir / (sheet.replace("/", "-").replace(" ", "_") + "_schedule.docx")
-        document.save(out_path)
-        console.print(f"[green]Wrote[/] {out_path}")
+        language = str(lang).strip() if lang_col else None
+        add_header(document, name, homeroom_num, grade, language)
+        add_table_2_5(document, class1_room, class2_room, tables)
+        document.add_page_break()
+    document.save(out_path)
+    return out_path
 
 
 # ----------------------- 6th–8th schedules ----------------------- #
@@ -311,107 +509,108 @@ SCHEDULE_ROWS_6_8: List[tuple[str, str]] = [
 
 def add_header_6_8(document: Document, name: str, homeroom: Optional[int], grade: str, language: Optional[str]) -> None:
     line1 = document.add_paragraph()
-    left = line1.add_run(f"Student:{name}")
-    left.bold = True
-    left.font.size = Pt(18)
+    _add_bold_run(line1, f"Student:{name}", 18)
     line1.add_run("\t\t\t")
-    right = line1.add_run(f"{grade} Grade")
-    right.bold = True
-    right.font.size = Pt(18)
+    _add_bold_run(line1, f"{grade} Grade", 18)
     line2 = document.add_paragraph()
-    l2a = line2.add_run(f"Homeroom: {homeroom if homeroom is not None else ''}")
-    l2a.bold = True
-    l2a.font.size = Pt(18)
+    _add_bold_run(line2, f"Homeroom: {homeroom if homeroom is not None else ''}", 18)
     line2.add_run("\t\t\t")
-    l2b = line2.add_run(f"Language: {language or ''}")
-    l2b.bold = True
-    l2b.font.size = Pt(18)
-
-
-def add_table_6_8(document: Document, c1: Optional[int], c2: Optional[int], c3: Optional[int]) -> None:
-    table = document.add_table(rows=1, cols=2)
-    table.alignment = WD_TABLE_ALIGNMENT.CENTER
-    table.style = "Table Grid"
-    hdr_time, hdr_sched = table.rows[0].cells
-    p1 = hdr_time.paragraphs[0]
-    p1.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    r1 = p1.add_run("TIME")
-    r1.bold = True
-    r1.font.size = Pt(14)
-    p2 = hdr_sched.paragraphs[0]
-    p2.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    r2 = p2.add_run("SCHEDULE")
-    r2.bold = True
-    r2.font.size = Pt(14)
-    for time_str, sched in SCHEDULE_ROWS_6_8:
-        row = table.add_row()
-        c_time, c_sched = row.cells
-        p_time = c_time.paragraphs[0]
-        p_time.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        rt = p_time.add_run(time_str)
-        rt.bold = True
-        rt.font.size = Pt(12)
-        text = sched
-        if "Class 1" in text and c1 is not None:
-            text = text.replace("Class 1", f"Class 1 (Room {c1})")
-        if "Class 2" in text and c2 is not None:
-            text = text.replace("Class 2", f"Class 2 (Room {c2})")
-        if "Class 3" in text and c3 is not None:
-            text = text.replace("Class 3", f"Class 3 (Room {c3})")
-        p_sched = c_sched.paragraphs[0]
-        p_sched.alignment = WD_ALIGN_PARAGRAPH.LEFT
-        rs = p_sched.add_run(text)
-        rs.font.size = Pt(12)
-
-
-def generate_6_8(frames: Dict[str, pd.DataFrame], outdir: Path) -> None:
-    for sheet in ["6th", "7th", "8th"]:
+    _add_bold_run(line2, f"Language: {language or ''}", 18)
+
+
+_CLASS_RE_6_8 = re.compile(r"Class ([123])")
+
+
+def _apply_rooms_6_8(c1: Optional[int], c2: Optional[int], c3: Optional[int]) -> List[tuple[str, str]]:
+    rooms = {1: c1, 2: c2, 3: c3}
+    return [(time_str, _sub_rooms(_CLASS_RE_6_8, sched, rooms)) for time_str, sched in SCHEDULE_ROWS_6_8]
+
+
+def add_table_6_8(
+    document: Document, c1: Optional[int], c2: Optional[int], c3: Optional[int], tables: TableCache
+) -> None:
+    key = (c1, c2, c3)
+    tbl = tables.get(key)
+    if tbl is None:
+        tbl = tables[key] = _build_schedule_tbl_xml(_column_width(document, 2), _apply_rooms_6_8(*key))
+    _append_block(document, copy.deepcopy(tbl))
+
+
+def _build_6_8_sheet(df: pd.DataFrame, grade: str, out_path: Path) -> Path:
+    cols = _index_columns(df)
+    name_col = cols["homeroom_col"]
+    lang_col = cols["language_col"]
+    c1 = cols["class_cols"].get(1)
+    c2 = cols["class_cols"].get(2)
+    c3 = cols["class_cols"].get(3)
+    homeroom_num = cols["homeroom_num"]
+    document = Document(io.BytesIO(_DEFAULT_TEMPLATE))
+    tables: TableCache = {}
+    names = df[name_col].to_numpy() if name_col else ()
+    langs = df[lang_col].to_numpy() if lang_col else itertools.repeat(None)
+    c1s = room_numbers(df[c1]) if c1 else itertools.repeat(None)
+    c2s = room_numbers(df[c2]) if c2 else itertools.repeat(None)
+    c3s = room_numbers(df[c3]) if c3 else itertools.repeat(None)
+    for name, lang, c1_room, c2_room, c3_room in zip(names, langs, c1s, c2s, c3s):
+        name = str(name).strip()
+        if not name:
+            continue
+        language = str(lang).strip() if lang_col else None
+        add_header_6_8(document, name, homeroom_num, grade, language)
+        add_table_6_8(document, c1_room, c2_room, c3_room, tables)
+        document.add_page_break()
+    document.save(out_path)
+    return out_path
+
+
+# ----------------------- Dispatch ----------------------- #
+
+def generate_all(
+    executor: Executor, frames: Dict[str, pd.DataFrame], teacher_by_room: Dict[str, str], outdir: Path
+) -> List[Future[Path]]:
+    futures: List[Future[Path]] = []
+    for sheet, grade, fname, kind in SHEETS_SPEC:
         if sheet not in frames:
-            console.print(f"[yellow]Skipping missing sheet:[/] {sheet}")
+            print(f"Skipping missing sheet: {sheet}")
             continue
         df = frames[sheet]
-        name_col = next((c for c in df.columns if isinstance(c, str) and c.lower().startswith("homeroom ")), None)
-        lang_col = "Language" if "Language" in df.columns else None
-        c1 = next((c for c in df.columns if isinstance(c, str) and c.lower().startswith("class 1")), None)
-        c2 = next((c for c in df.columns if isinstance(c, str) and c.lower().startswith("class 2")), None)
-        c3 = next((c for c in df.columns if isinstance(c, str) and c.lower().startswith("class 3")), None)
-        homeroom_num = None
-        if isinstance(name_col, str):
-            try:
-                homeroom_num = int(name_col.split(" ", 1)[1])
-            except Exception:
-                pass
-        document = Document()
-        for _, row in df.iterrows():
-            name = str(row.get(name_col, "")).strip()
-            if not name:
-                continue
-            def to_int(v):
-                try:
-                    return int(v) if pd.notna(v) else None
-                except Exception:
-                    return None
-            c1_room = to_int(row.get(c1)) if c1 else None
-            c2_room = to_int(row.get(c2)) if c2 else None
-            c3_room = to_int(row.get(c3)) if c3 else None
-            language = str(row.get(lang_col, "")).strip() if lang_col else None
-            add_header_6_8(document, name, homeroom_num, sheet, language)
-            add_table_6_8(document, c1_room, c2_room, c3_room)
-            document.add_page_break()
-        out_path = outdir / (sheet.replace("/", "-").replace(" ", "_") + "_schedule.docx")
-        document.save(out_path)
-        console.print(f"[green]Wrote[/] {out_path}")
+        out_path = outdir / fname
+        if kind == "cards":
+            futures.append(executor.submit(_build_cards_sheet, df, grade, out_path, teacher_by_room))
+        elif kind == "sched_2_5":
+            futures.append(executor.submit(_build_2_5_sheet, df, grade, out_path))
+        elif kind == "sched_6_8":
+            futures.append(executor.submit(_build_6_8_sheet, df, grade, out_path))
+        else:
+            raise ValueError(f"Unknown generator kind for sheet {sheet}: {kind}")
+    return futures
+
+
+def make_executor() -> Executor:
+    workers = min(os.process_cpu_count() or 1, 10)
+    if workers == 1:
+        # A single core gains nothing from extra processes; threads skip worker start-up and
+        # pickling each sheet's DataFrame across to it.
+        return ThreadPoolExecutor(max_workers=1)
+    return ProcessPoolExecutor(max_workers=workers)
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate homeroom cards and schedules.")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Re-read {WORKBOOK_NAME} and refresh its parsed copy in {CACHE_DIR}/.",
+    )
+    args = parser.parse_args()
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     workbook_path = Path(WORKBOOK_NAME)
     teacher_csv_path = Path(TEACHER_CSV_NAME)
-    frames = load_workbook(workbook_path)
+    frames = load_workbook(workbook_path, read_cache=not args.no_cache)
     teacher_map = load_teacher_mapping(teacher_csv_path)
-    generate_cards(frames, teacher_map, OUTPUT_DIR)
-    generate_2_5(frames, OUTPUT_DIR)
-    generate_6_8(frames, OUTPUT_DIR)
+    with make_executor() as executor:
+        for future in generate_all(executor, frames, teacher_map, OUTPUT_DIR):
+            print(f"Wrote {future.result()}")
 
 
 if __name__ == "__main__":